@@ -1,14 +1,24 @@
 import os
+import re
 import typing as t
-from dataclasses import dataclass
-from itertools import zip_longest
+from dataclasses import dataclass, field
 from packaging.requirements import Requirement
 
 import yaml
+import fastjsonschema
 import jsonschema
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    # PyYAML was built without libyaml
+    from yaml import SafeLoader as _SafeLoader  # type: ignore
+
 __all__ = ["settings"]
 
+_TARGET_NAME_PATTERN = r"^[a-z0-9_]+$"
+_TARGET_NAME_RE = re.compile(_TARGET_NAME_PATTERN)
+
 CREDENTIALS_SCHEMA = {
     "type": "object",
     "properties": {
@@ -91,15 +101,29 @@ CONFIG_SCHEMA = {
                 "where we put the built things. As many as we have arches + pythonversions ("
                 " or maybe just arches? You can have several pythonversions coexist in one repo)"
             ),
-            "patternProperties": {"^[a-z0-9_]+$": {"$ref": "#/definitions/target"}},
+            "patternProperties": {
+                _TARGET_NAME_PATTERN: {"$ref": "#/definitions/target"}
+            },
         },
     },
     "required": ["origin", "source", "targets"],
     "additionalProperties": False,
 }
 
+# Schemas are compiled into python validators once, at import time
+_validate_credentials = fastjsonschema.compile(CREDENTIALS_SCHEMA)
+_validate_config = fastjsonschema.compile(CONFIG_SCHEMA)
+
 
-@dataclass
+def _validate(validator: t.Callable[[t.Any], t.Any], instance: t.Any) -> None:
+    try:
+        validator(instance)
+    except fastjsonschema.JsonSchemaException as exc:
+        # Keep raising jsonschema errors, these are a part of the public behaviour
+        raise jsonschema.ValidationError(exc.message) from exc
+
+
+@dataclass(frozen=True)
 class Origin:
     location: str
     credentials: t.Optional["Credentials"]
@@ -111,16 +135,8 @@ class Origin:
             credentials=Credentials.from_path(path=blob.get("credentialsPath")),
         )
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Origin):
-            raise TypeError(
-                f"'==' not supported between instances of '{self.__class__.__name__}' and"
-                f" '{other.__class__.__name__}'"
-            )
-        return self.location == other.location and self.credentials == other.credentials
-
 
-@dataclass
+@dataclass(frozen=True)
 class Credentials:
     username: str
     password: str
@@ -130,35 +146,42 @@ class Credentials:
         if not path:
             return None
 
-        try:
-            with open(path, "rt") as fid:
-                credentials = yaml.safe_load(fid)
-        except yaml.YAMLError:
-            # Raise from None to avoid accidental leaks
-            raise yaml.YAMLError(
-                f"Unable to load credentials from '{path}', it appears to be a non-yaml file"
-            ) from None
-        except OSError as exc:
-            raise OSError(f"Unable to load credentials from '{path}'") from exc
-
-        # As these are loaded later, a runtime validation is needed
-        jsonschema.validate(instance=credentials, schema=CREDENTIALS_SCHEMA)
-
-        return cls(username=credentials["username"], password=credentials["password"])
+        # The same credentials file is usually shared by several repos, load it only once
+        key = os.path.realpath(path)
+        credentials = _credentials_cache.get(key)
+        if credentials is None:
+            credentials = _credentials_cache[key] = _load_credentials(path)
+        return credentials
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(username='{self.username}', password='***')"
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Credentials):
-            raise TypeError(
-                f"'==' not supported between instances of '{self.__class__.__name__}' and"
-                f" '{other.__class__.__name__}'"
-            )
-        return self.username == other.username and self.password == other.password
+
+# Credentials loaded during the current config load, keyed by resolved path
+_credentials_cache: t.Dict[str, Credentials] = {}
 
 
-@dataclass
+def _load_credentials(path: str) -> Credentials:
+    try:
+        with open(path, "rb") as fid:
+            credentials = yaml.load(fid.read(), Loader=_SafeLoader)
+    except yaml.YAMLError:
+        # Raise from None to avoid accidental leaks
+        raise yaml.YAMLError(
+            f"Unable to load credentials from '{path}', it appears to be a non-yaml file"
+        ) from None
+    except OSError as exc:
+        raise OSError(f"Unable to load credentials from '{path}'") from exc
+
+    # As these are loaded later, a runtime validation is needed
+    _validate(_validate_credentials, credentials)
+
+    return Credentials(
+        username=credentials["username"], password=credentials["password"]
+    )
+
+
+@dataclass(frozen=True)
 class Source:
     location: str
     credentials: t.Optional["Credentials"]
@@ -170,16 +193,8 @@ class Source:
             credentials=Credentials.from_path(path=blob.get("credentialsPath")),
         )
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Source):
-            raise TypeError(
-                f"'==' not supported between instances of '{self.__class__.__name__}' and"
-                f" '{other.__class__.__name__}'"
-            )
-        return self.location == other.location and self.credentials == other.credentials
-
 
-@dataclass
+@dataclass(frozen=True)
 class Target:
     location: str
     variables: t.Dict[str, t.Any]
@@ -193,20 +208,8 @@ class Target:
             credentials=Credentials.from_path(path=blob.get("credentialsPath")),
         )
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Target):
-            raise TypeError(
-                f"'==' not supported between instances of '{self.__class__.__name__}' and"
-                f" '{other.__class__.__name__}'"
-            )
-        return (
-            self.location == other.location
-            and self.variables == other.variables
-            and self.credentials == other.credentials
-        )
-
 
-@dataclass
+@dataclass(frozen=True)
 class ConfigEntry:
     origin: Origin
     source: Source
@@ -214,7 +217,13 @@ class ConfigEntry:
 
     @classmethod
     def from_dict(cls, blob: t.Dict) -> "ConfigEntry":
-        jsonschema.validate(instance=blob, schema=CONFIG_SCHEMA)
+        _validate(_validate_config, blob)
+        # `patternProperties` only validates the matching names, reject the rest here
+        for name in blob["targets"]:
+            if not _TARGET_NAME_RE.match(name):
+                raise jsonschema.ValidationError(
+                    f"Target name '{name}' does not match '{_TARGET_NAME_PATTERN}'"
+                )
         return cls(
             origin=Origin.from_dict(blob["origin"]),
             source=Source.from_dict(blob["source"]),
@@ -224,23 +233,32 @@ class ConfigEntry:
             },
         )
 
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, ConfigEntry):
-            raise TypeError(
-                f"'==' not supported between instances of '{self.__class__.__name__}' and"
-                f" '{other.__class__.__name__}'"
-            )
-        return (
-            self.origin == other.origin
-            and self.source == other.source
-            and self.targets == other.targets
-        )
-
 
-@dataclass
+@dataclass(frozen=True)
 class RootConfig:
     entry: ConfigEntry
-    packages: t.List[Requirement]
+    # Requirement lines of the package list, parsed on first access to `packages`
+    package_lines: t.Tuple[str, ...]
+    _parsed: t.Optional[t.Tuple[t.List[Requirement], t.Tuple[str, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def packages(self) -> t.List[Requirement]:
+        return self._parse()[0]
+
+    @property
+    def _package_keys(self) -> t.Tuple[str, ...]:
+        return self._parse()[1]
+
+    def _parse(self) -> t.Tuple[t.List[Requirement], t.Tuple[str, ...]]:
+        parsed = self._parsed
+        if parsed is None:
+            packages = [Requirement(line) for line in self.package_lines]
+            # Canonical form of `packages`, Requirement objects do not compare by value
+            parsed = packages, tuple(str(pkg) for pkg in packages)
+            object.__setattr__(self, "_parsed", parsed)
+        return parsed
 
     @classmethod
     def get_instance(cls) -> "RootConfig":
@@ -258,9 +276,13 @@ class RootConfig:
                 f"package file list"
             )
 
+        # Credentials may have been rotated since a previous load, read them again
+        _credentials_cache.clear()
         try:
-            with open(config_path, "rt") as fid:
-                entry = ConfigEntry.from_dict(blob=yaml.safe_load(fid))
+            with open(config_path, "rb") as fid:
+                entry = ConfigEntry.from_dict(
+                    blob=yaml.load(fid.read(), Loader=_SafeLoader)
+                )
         except yaml.YAMLError as exc:
             raise yaml.YAMLError(
                 f"Unable to load config from '{config_path}', it appears to be a non-yaml file"
@@ -270,40 +292,40 @@ class RootConfig:
 
         try:
             with open(packages_path, "rt") as fid:
-                packages = [Requirement(package) for package in fid]
+                package_lines = tuple(
+                    line
+                    for line in (raw_line.strip() for raw_line in fid)
+                    if line and not line.startswith("#")
+                )
         except OSError as exc:
             raise OSError(f"Unable to load packages from '{packages_path}'") from exc
 
-        return cls(entry=entry, packages=packages)
+        return cls(entry=entry, package_lines=package_lines)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, RootConfig):
-            raise TypeError(
-                f"'==' not supported between instances of '{self.__class__.__name__}' and"
-                f" '{other.__class__.__name__}'"
-            )
-        return (
-            all(
-                str(self_pkg) == str(other_pkg)
-                for self_pkg, other_pkg in zip_longest(self.packages, other.packages)
-            )
-            and self.entry == other.entry
-        )
+            return NotImplemented
+        return self._package_keys == other._package_keys and self.entry == other.entry
+
+    def __hash__(self) -> int:
+        # Consistent with __eq__, `entry` holds dicts and cannot be hashed
+        return hash(self._package_keys)
 
 
 class Settings:
     root: RootConfig
 
-    def __getattribute__(self, name: str) -> t.Any:
-        try:
-            return super().__getattribute__(name)
-        except AttributeError as exc:
-            if name == "root":
-                raise ImportError(
-                    f"Application is improperly configured. Before accessing 'settings.{name}'"
-                    f" '{__name__}.settings.configure()' needs to called"
-                ) from exc
-            raise
+    def __getattr__(self, name: str) -> t.Any:
+        # Only called when the regular lookup fails, so a configured `root` is a plain
+        # instance attribute access
+        if name == "root":
+            raise ImportError(
+                f"Application is improperly configured. Before accessing 'settings.{name}'"
+                f" '{__name__}.settings.configure()' needs to called"
+            )
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Settings):
@@ -335,6 +357,3 @@ class Settings:
 
 
 settings = Settings()
-
-
-settings = Settings()
@@ -2,7 +2,9 @@
 Objects representing repos that store python distributions
 """
 import os.path
+import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 
 import twine.settings
 from pypi_simple import PyPISimple
@@ -13,6 +15,9 @@ from .utils import download_file
 
 __all__ = ["LocalRepo", "SimpleRepo", "PythonDistributionRepo"]
 
+# Seconds for which a fetched project listing is reused
+LISTING_TTL = 60.0
+
 
 class PythonDistributionRepo:
     """
@@ -25,12 +30,18 @@ class PythonDistributionRepo:
     def project_files(self, project: t.Any) -> t.Any:
         raise NotImplementedError
 
-    def download(self, project: t.Any, file: t.Any, dest: t.Any) -> t.Any:
+    def download(
+        self, project: t.Any, file: t.Any, dest: t.Any, *, dist: t.Any = None
+    ) -> t.Any:
         raise NotImplementedError
 
     def upload(self, project: t.Any, file: t.Any) -> t.Any:
         raise NotImplementedError
 
+    def upload_many(self, project: t.Any, files: t.Iterable[t.Any]) -> t.Any:
+        for file in files:
+            self.upload(project, file)
+
     def download_sdist(self, project: t.Any, version: t.Any, dir: t.Any) -> t.Any:
         sdists = [
             dist
@@ -40,8 +51,8 @@ class PythonDistributionRepo:
         if not sdists:
             raise NotAvailable(f"No sdists for {project}={version}")
         sdist = sdists[0]
-        # FIXME download `dest` is wrong, added to pass mypy checks
-        return self.download(project, sdist[0].filename, dest=None)
+        # Hand over the resolved file, so that the project files are not fetched again
+        return self.download(project, sdist.filename, dest=dir, dist=sdist)
 
 
 class SimpleRepo(PythonDistributionRepo):
@@ -49,32 +60,97 @@ class SimpleRepo(PythonDistributionRepo):
 
     _username: t.Optional[str]
     _password: t.Optional[str]
+    _twine_settings_cache: t.Optional[twine.settings.Settings]
+    _listing_cache: t.Dict[str, t.Tuple[float, t.Tuple[t.Any, ...]]]
     url: str
     client: PyPISimple
 
     def __init__(self, url: str, auth: t.Tuple[str, str] = None) -> None:
         self.url = url
         self._username, self._password = auth or (None, None)
+        self._twine_settings_cache = None
+        self._listing_cache = {}
         self.client = PyPISimple(endpoint=url)
 
-    def project_files(self, project: t.Any) -> t.Any:
-        return self.client.get_project_files(project)
+    @property
+    def _twine_settings(self) -> twine.settings.Settings:
+        # Built on first upload only, twine reads .pypirc and sets up keyring on creation
+        if self._twine_settings_cache is None:
+            self._twine_settings_cache = twine.settings.Settings(
+                repository_url=self.url,
+                username=self._username,
+                password=self._password,
+            )
+        return self._twine_settings_cache
 
-    def download(self, project: t.Any, file: t.Any, dest: t.Any) -> t.Any:
-        dists = [x for x in self.project_files(project) if x.filename == file]
-        if not dists:
+    def project_files(self, project: t.Any) -> t.Any:
+        cached = self._listing_cache.get(project)
+        if cached is not None and time.monotonic() - cached[0] < LISTING_TTL:
+            return cached[1]
+        # Cached listings are shared between callers, keep them immutable
+        files = tuple(self.client.get_project_files(project))
+        self._listing_cache[project] = (time.monotonic(), files)
+        return files
+
+    def invalidate(self, project: t.Any = None) -> None:
+        """ Drop cached project listings, for the given project only or for all of them """
+        if project is None:
+            self._listing_cache.clear()
+        else:
+            self._listing_cache.pop(project, None)
+
+    def _project_index(self, project: t.Any) -> t.Dict[str, t.Any]:
+        """ Project files keyed by their filename """
+        return {dist.filename: dist for dist in self.project_files(project)}
+
+    def download(
+        self, project: t.Any, file: t.Any, dest: t.Any, *, dist: t.Any = None
+    ) -> t.Any:
+        if dist is None:
+            dist = self._project_index(project).get(file)
+        if dist is None:
             raise NotAvailable(f"{file} is not available in project{project}")
-        dist = dists[0]
         full_fname = os.path.join(dest, dist.filename)
         download_file(dist.url, full_fname)
         return full_fname
 
+    def download_many(
+        self, project: t.Any, files: t.Iterable[str], dest: str, max_workers: int = 16
+    ) -> t.Dict[str, t.Union[str, BaseException]]:
+        """
+        Download several files of a project concurrently. Returns the downloaded path for
+        every file, a failed download maps to its exception in place of the path
+        """
+        dists = self._project_index(project)
+        results: t.Dict[str, t.Union[str, BaseException]] = {}
+        futures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # A file listed twice would be written by two threads at once
+            for file in dict.fromkeys(files):
+                dist = dists.get(file)
+                if dist is None:
+                    results[file] = NotAvailable(
+                        f"{file} is not available in project{project}"
+                    )
+                    continue
+                full_fname = os.path.join(dest, dist.filename)
+                future = executor.submit(download_file, dist.url, full_fname)
+                futures[future] = (file, full_fname)
+
+        for future, (file, full_fname) in futures.items():
+            exc = future.exception()
+            results[file] = full_fname if exc is None else exc
+        return results
+
     def upload(self, project: t.Any, file: t.Any) -> t.Any:
-        settings = twine.settings.Settings(
-            repository_url=self.url, username=self._username, password=self._password
-        )
         # TODO: use twine Repository object instead of command?
-        twine_upload(settings, [file])
+        twine_upload(self._twine_settings, [file])
+        self.invalidate(project)
+
+    def upload_many(self, project: t.Any, files: t.Iterable[t.Any]) -> t.Any:
+        # twine uploads all the files over a single repository connection
+        twine_upload(self._twine_settings, list(files))
+        self.invalidate(project)
 
 
 class LocalRepo(PythonDistributionRepo):
@@ -1,9 +1,38 @@
+import shutil
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connect and read timeouts, in seconds
+_TIMEOUT = (10, 60)
+
+# The connection pool is thread safe and shared, keeping connections (and TLS sessions)
+# alive between downloads
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+
+# requests.Session is not guaranteed to be thread safe, every thread gets its own
+_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+        session.mount("http://", _ADAPTER)
+        session.mount("https://", _ADAPTER)
+    return session
 
 
 def download_file(url: str, full_path: str) -> None:
-    res = requests.get(url, stream=True)
-    res.raise_for_status()
-    with open(full_path, "wb") as f:
-        for chunk in res.iter_content():
-            f.write(chunk)
+    with _get_session().get(url, stream=True, timeout=_TIMEOUT) as res:
+        res.raise_for_status()
+        # Let urllib3 undo any transfer encoding, then copy in large blocks
+        res.raw.decode_content = True
+        with open(full_path, "wb") as f:
+            shutil.copyfileobj(res.raw, f, length=1024 * 1024)
@@ -7,7 +7,14 @@ here = path.abspath(path.dirname(__file__))
 with open(path.join(here, "README.md"), encoding="utf-8") as f:
     long_description = f.read()
 
-install_requires = ["pyyaml", "pypi_simple", "twine", "requests", "jsonschema"]
+install_requires = [
+    "pyyaml",
+    "pypi_simple",
+    "twine",
+    "requests",
+    "jsonschema",
+    "fastjsonschema",
+]
 
 setup(
     name="bigrig",
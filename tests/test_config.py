@@ -0,0 +1,127 @@
+import copy
+import pickle
+import typing as t
+from unittest import mock
+
+import jsonschema
+import pytest
+
+from bigrig import config
+from bigrig.config import ConfigEntry, Credentials, Origin, RootConfig, Source, Target
+
+
+@pytest.fixture
+def root_config() -> RootConfig:
+    credentials = Credentials(username="user", password="secret")
+    entry = ConfigEntry(
+        origin=Origin(location="https://pypi.org/simple", credentials=None),
+        source=Source(
+            location="https://source.example/simple", credentials=credentials
+        ),
+        targets={
+            "x86_64": Target(
+                location="https://target.example/simple",
+                variables={"arch": "x86_64"},
+                credentials=credentials,
+            )
+        },
+    )
+    return RootConfig(entry=entry, package_lines=("foo>=1", "bar"))
+
+
+@pytest.mark.parametrize(
+    "roundtrip",
+    [copy.copy, copy.deepcopy, lambda obj: pickle.loads(pickle.dumps(obj))],
+    ids=["copy", "deepcopy", "pickle"],
+)
+def test_config_roundtrip(root_config: RootConfig, roundtrip: t.Any) -> None:
+    for obj in (
+        root_config,
+        root_config.entry,
+        root_config.entry.origin,
+        root_config.entry.source,
+        root_config.entry.source.credentials,
+        root_config.entry.targets["x86_64"],
+    ):
+        assert roundtrip(obj) == obj
+
+
+def test_root_config_hash_matches_eq(root_config: RootConfig) -> None:
+    other = RootConfig(entry=root_config.entry, package_lines=("foo >= 1", "bar"))
+    assert other == root_config
+    assert hash(other) == hash(root_config)
+    assert len({root_config, other}) == 1
+
+
+@pytest.fixture
+def config_blob() -> t.Dict[str, t.Any]:
+    return {
+        "origin": {"location": "https://pypi.org/simple"},
+        "source": {"location": "https://source.example/simple"},
+        "targets": {
+            "x86_64": {
+                "location": "https://target.example/simple",
+                "variables": {"arch": "x86_64"},
+            }
+        },
+    }
+
+
+def test_config_entry_from_dict(config_blob: t.Dict[str, t.Any]) -> None:
+    entry = ConfigEntry.from_dict(config_blob)
+    assert entry.origin == Origin(location="https://pypi.org/simple", credentials=None)
+    assert entry.targets["x86_64"].variables == {"arch": "x86_64"}
+
+
+def test_config_entry_rejects_bad_target_name(config_blob: t.Dict[str, t.Any]) -> None:
+    config_blob["targets"]["X86"] = config_blob["targets"].pop("x86_64")
+    with pytest.raises(jsonschema.ValidationError, match="X86"):
+        ConfigEntry.from_dict(config_blob)
+
+
+def test_config_entry_rejects_invalid_config(config_blob: t.Dict[str, t.Any]) -> None:
+    del config_blob["source"]
+    with pytest.raises(jsonschema.ValidationError):
+        ConfigEntry.from_dict(config_blob)
+
+
+@pytest.fixture
+def config_dir(tmp_path: t.Any, monkeypatch: t.Any) -> t.Any:
+    (tmp_path / "creds.yaml").write_text("username: user\npassword: secret\n")
+    (tmp_path / "config.yaml").write_text(
+        "origin: {location: o, credentialsPath: creds.yaml}\n"
+        "source: {location: s, credentialsPath: ./creds.yaml}\n"
+        "targets: {x86_64: {location: t, variables: {}}}\n"
+    )
+    (tmp_path / "packages.txt").write_text("foo>=1\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("BIGRIG_CONFIG_PATH", "config.yaml")
+    monkeypatch.setenv("BIGRIG_PACKAGES_PATH", "packages.txt")
+    monkeypatch.setattr(config, "_credentials_cache", {})
+    return tmp_path
+
+
+def test_credentials_loaded_once_per_path(
+    config_dir: t.Any, monkeypatch: t.Any
+) -> None:
+    load = mock.Mock(wraps=config._load_credentials)
+    monkeypatch.setattr(config, "_load_credentials", load)
+
+    first = Credentials.from_path("creds.yaml")
+    second = Credentials.from_path("./creds.yaml")
+
+    assert first is second
+    load.assert_called_once_with("creds.yaml")
+
+
+def test_credentials_reloaded_by_get_instance(config_dir: t.Any) -> None:
+    entry = RootConfig.get_instance().entry
+    assert entry.origin.credentials is entry.source.credentials
+    assert entry.origin.credentials == Credentials(username="user", password="secret")
+
+    (config_dir / "creds.yaml").write_text("username: rotated\npassword: secret\n")
+
+    entry = RootConfig.get_instance().entry
+    assert entry.origin.credentials == Credentials(
+        username="rotated", password="secret"
+    )
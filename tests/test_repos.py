@@ -0,0 +1,85 @@
+import os.path
+import typing as t
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from bigrig import repos
+from bigrig.exceptions import NotAvailable
+from bigrig.repos import SimpleRepo
+
+
+def make_dist(filename: str) -> SimpleNamespace:
+    return SimpleNamespace(filename=filename, url=f"https://files.example/{filename}")
+
+
+@pytest.fixture
+def repo() -> SimpleRepo:
+    repo = SimpleRepo("https://repo.example/simple")
+    repo.client = mock.Mock()
+    repo.client.get_project_files.return_value = [
+        make_dist("foo-1.0.tar.gz"),
+        make_dist("foo-1.0-py3-none-any.whl"),
+    ]
+    return repo
+
+
+def test_download_many(repo: SimpleRepo, monkeypatch: t.Any) -> None:
+    def fake_download_file(url: str, full_path: str) -> None:
+        if full_path.endswith(".whl"):
+            raise OSError("connection reset")
+
+    download_file = mock.Mock(side_effect=fake_download_file)
+    monkeypatch.setattr(repos, "download_file", download_file)
+
+    results = repo.download_many(
+        "foo",
+        [
+            "foo-1.0.tar.gz",
+            "foo-1.0-py3-none-any.whl",
+            "foo-2.0.tar.gz",
+            "foo-1.0.tar.gz",
+        ],
+        dest="/dest",
+    )
+
+    assert results.keys() == {
+        "foo-1.0.tar.gz",
+        "foo-1.0-py3-none-any.whl",
+        "foo-2.0.tar.gz",
+    }
+    assert results["foo-1.0.tar.gz"] == os.path.join("/dest", "foo-1.0.tar.gz")
+    assert isinstance(results["foo-1.0-py3-none-any.whl"], OSError)
+    assert isinstance(results["foo-2.0.tar.gz"], NotAvailable)
+    # The duplicate name is downloaded once, the missing file is not downloaded at all
+    assert download_file.call_count == 2
+    repo.client.get_project_files.assert_called_once_with("foo")
+
+
+def test_project_files_cached(repo: SimpleRepo, monkeypatch: t.Any) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(repos, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    get_project_files = repo.client.get_project_files
+
+    files = repo.project_files("foo")
+    assert isinstance(files, tuple)
+    assert repo.project_files("foo") is files
+    get_project_files.assert_called_once_with("foo")
+
+    now[0] += repos.LISTING_TTL
+    repo.project_files("foo")
+    assert get_project_files.call_count == 2
+
+
+def test_upload_invalidates_listing(repo: SimpleRepo, monkeypatch: t.Any) -> None:
+    monkeypatch.setattr(repos.twine.settings, "Settings", mock.Mock())
+    twine_upload = mock.Mock()
+    monkeypatch.setattr(repos, "twine_upload", twine_upload)
+
+    repo.project_files("foo")
+    repo.upload("foo", "foo-1.1.tar.gz")
+    repo.project_files("foo")
+
+    twine_upload.assert_called_once()
+    assert repo.client.get_project_files.call_count == 2
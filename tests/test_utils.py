@@ -0,0 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from bigrig import utils
+
+
+def test_session_per_thread_shares_adapter() -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sessions = list(executor.map(lambda _: utils._get_session(), range(2)))
+    main_session = utils._get_session()
+
+    assert main_session is utils._get_session()
+    assert main_session not in sessions
+    for session in sessions + [main_session]:
+        assert session.get_adapter("https://files.example/") is utils._ADAPTER